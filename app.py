@@ -4,19 +4,41 @@ Script for building Streamlit app
 
 """
 
+import gzip
+import json
+import os
+from functools import lru_cache
+
 import streamlit as st
 import pandas as pd
-import geopandas as gpd
-import numpy as np
-import plotly.express as px
+import pyarrow.parquet as pq
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Serialize figures with orjson: st.plotly_chart encodes every figure with
+# plotly.io.to_json, and the map figures carry large GeoJSON payloads
+pio.json.config.default_engine = "orjson"
 
 # Input data filepaths
 DATA_DIR = "./data/preprocessed/"
 ADMIN1_FILEPATH = f"{DATA_DIR}app_admin1_aggregated.parquet"
 COUNTRY_FILEPATH = f"{DATA_DIR}app_country_aggregated.parquet"
 SUBREGION_FILEPATH = f"{DATA_DIR}app_subregion_aggregated.parquet"
-ANNUAL_GLOBAL_FILEPATH = f"{DATA_DIR}app_annual_global_totals.parquet"
+ANNUAL_GLOBAL_FILEPATH = f"{DATA_DIR}app_annual_global_totals.json"
 LAND_OUTLINE_FILEPATH = f"{DATA_DIR}app_land_outline.parquet"
+TOP_REGIONS_FILEPATH = f"{DATA_DIR}app_top_regions.parquet"
+COUNTRY_BORDERS_FILEPATH = f"{DATA_DIR}app_country_borders.parquet"
+REGION_FILEPATHS = {
+    "Admin1 (States/Provinces)": ADMIN1_FILEPATH,
+    "Country": COUNTRY_FILEPATH,
+    "UN Subregion": SUBREGION_FILEPATH,
+}
+REGION_GEOJSON_FILEPATHS = {
+    "Admin1 (States/Provinces)": f"{DATA_DIR}app_admin1_boundaries.geojson.gz",
+    "Country": f"{DATA_DIR}app_country_boundaries.geojson.gz",
+    "UN Subregion": f"{DATA_DIR}app_subregion_boundaries.geojson.gz",
+}
+STYLESHEET_FILEPATH = "./static/app.css"
 
 # Global text colors
 HEADER_COLOR = "#003D5C"
@@ -27,6 +49,22 @@ PLOT_BG_COLOR = "white"
 WATER_COLOR = "#E6F7FF"
 GRID_COLOR = "lightgray"
 
+# Layout shared by every figure; figures only add their title text and axes
+PLOT_LAYOUT = {
+    "height": PLOT_HEIGHT,
+    "autosize": True,
+    "showlegend": False,
+    "font": {"color": HEADER_COLOR},
+    "title": {
+        "x": 0.5,
+        "xanchor": "center",
+        "font": {"size": 26, "color": HEADER_COLOR},
+    },
+    "plot_bgcolor": PLOT_BG_COLOR,
+    "paper_bgcolor": PLOT_BG_COLOR,
+    "margin": {"l": 10, "r": 10, "t": 50, "b": 10},
+}
+
 # Widget defaults
 DEFAULT_VARIABLE = "Economic Damages"
 DEFAULT_REGION = "Admin1 (States/Provinces)"
@@ -34,6 +72,36 @@ DEFAULT_AGG_METRIC = "Mean"
 DEFAULT_NUM_REGIONS = 15
 MAX_NUM_REGIONS = 30
 
+# Widget options
+VARIABLE_OPTIONS = [
+    "Economic Damages",
+    "Population Affected",
+    "Flooded Area",
+    "Flood Count",
+    "Avg Precipitation (Flood)",
+    "Avg 75th Percentile Precipitation (Flood)",
+]
+REGION_OPTIONS = ["Admin1 (States/Provinces)", "Country", "UN Subregion"]
+AGG_METRIC_OPTIONS = ["Mean", "Median", "Max", "Sum"]
+
+# Precipitation variables aren't normalized, and summing them doesn't make sense
+PRECIP_VARS = frozenset(
+    ["Avg Precipitation (Flood)", "Avg 75th Percentile Precipitation (Flood)"]
+)
+PRECIP_AGG_METRIC_OPTIONS = ["Mean", "Median", "Max"]
+
+# Statistics offered for each variable, flood count is only ever a total
+VALID_STATS = {
+    variable: (
+        PRECIP_AGG_METRIC_OPTIONS if variable in PRECIP_VARS else AGG_METRIC_OPTIONS
+    )
+    for variable in VARIABLE_OPTIONS
+}
+VALID_STATS["Flood Count"] = ["Sum"]
+
+# Annual totals are only meaningful for the impact variables and flood count
+TIMESERIES_VARIABLE_OPTIONS = [v for v in VARIABLE_OPTIONS if v not in PRECIP_VARS]
+
 # Variable descriptions
 VARIABLE_DESCRIPTIONS = {
     "Economic Damages": {
@@ -56,6 +124,48 @@ VARIABLE_DESCRIPTIONS = {
     },
 }
 
+# Units shown on the map colorbar
+VARIABLE_UNITS = {
+    "Economic Damages": "USD",
+    "Population Affected": "People",
+    "Flooded Area": "km²",
+    "Flood Count": "Events",
+    "Avg Precipitation (Flood)": "mm/day",
+    "Avg 75th Percentile Precipitation (Flood)": "mm/day",
+}
+
+# Base and normalized column prefixes for each variable
+var_map = {
+    "Economic Damages": ("damages", "damages_norm"),
+    "Population Affected": ("pop_affected", "pop_affected_norm"),
+    "Flooded Area": ("flooded_area", "flooded_area_norm"),
+    "Flood Count": (None, None),
+    "Avg Precipitation (Flood)": ("avg_precip", None),
+    "Avg 75th Percentile Precipitation (Flood)": ("extreme_precip_75", None),
+}
+
+# Id and display name columns for each region level
+region_id_map = {
+    "Admin1 (States/Provinces)": "adm1_code",
+    "Country": "ISO",
+    "UN Subregion": "UN Subregion",
+}
+
+region_name_map = {
+    "Admin1 (States/Provinces)": "Admin1 (States/Provinces)",
+    "Country": "Country",
+    "UN Subregion": "UN Subregion",
+}
+
+# Plot title templates, filled in with the selected statistic
+TITLE_FORMATS = {variable: f"{{agg}} {variable}" for variable in VARIABLE_OPTIONS}
+TITLE_FORMATS["Flood Count"] = "Flood Event Count"
+NORMALIZED_TITLE_FORMATS = {
+    "Economic Damages": "{agg} Economic Damages (% of GDP)",
+    "Population Affected": "{agg} Population Affected (% of Total)",
+    "Flooded Area": "{agg} Flooded Area (% of Total Area)",
+}
+
 # Variable-specific color palettes
 COLOR_PALETTES = {
     "Flooded Area": [
@@ -110,35 +220,44 @@ COLOR_PALETTES = {
 
 
 # Helper functions
-def get_plot_title_config(title_text):
-    """Create standardized title configuration for plots"""
-    return dict(
-        text=title_text, x=0.5, xanchor="center", font=dict(size=26, color=HEADER_COLOR)
+@lru_cache(maxsize=64)
+def get_bar_layout(title_text):
+    """Create the top regions bar chart layout, shared by every number of regions"""
+    # Plotly copies the Layout into each new Figure, so the cached one isn't mutated
+    return go.Layout(
+        PLOT_LAYOUT,
+        title_text=title_text,
+        xaxis_title=title_text,
+        yaxis={"categoryorder": "total ascending"},
     )
 
 
+@lru_cache(maxsize=64)
 def generate_title(variable, agg_metric, normalize):
     """Generate appropriate title based on variable and normalization"""
-    if variable == "Flood Count":
-        return "Flood Event Count"
-
-    # Precipitation variables don't use normalization
-    precip_vars = [
-        "Avg Precipitation (Flood)",
-        "Avg 75th Percentile Precipitation (Flood)",
-    ]
-    if variable in precip_vars:
-        return f"{agg_metric} {variable}"
-
+    # Flood count and precipitation variables have no normalized title
+    title_format = TITLE_FORMATS[variable]
     if normalize:
-        norm_labels = {
-            "Economic Damages": f"{agg_metric} Economic Damages (% of GDP)",
-            "Population Affected": f"{agg_metric} Population Affected (% of Total)",
-            "Flooded Area": f"{agg_metric} Flooded Area (% of Total Area)",
-        }
-        return norm_labels.get(variable, f"{agg_metric} {variable}")
+        title_format = NORMALIZED_TITLE_FORMATS.get(variable, title_format)
+    return title_format.format(agg=agg_metric)
 
-    return f"{agg_metric} {variable}"
+
+def build_value_col(variable, normalize, agg_metric):
+    """Build the aggregated column name for a variable and statistic"""
+    if variable == "Flood Count":
+        return "flood_count"
+    base_col, norm_col = var_map[variable]
+    base_name = norm_col if (normalize and norm_col) else base_col
+    return f"{base_name}_{agg_metric.lower()}"
+
+
+# Column holding each (variable, normalize, agg_metric) combination
+value_col_map = {
+    (variable, normalize, agg_metric): build_value_col(variable, normalize, agg_metric)
+    for variable in var_map
+    for normalize in [False, True]
+    for agg_metric in VALID_STATS[variable]
+}
 
 
 # Set title
@@ -150,68 +269,240 @@ st.set_page_config(
 
 
 # Read in data - will load appropriate file based on region selection
-@st.cache_data
-def load_regional_data(region):
-    """Load pre-aggregated data with geometries based on region selection"""
-    if region == "Admin1 (States/Provinces)":
-        return gpd.read_parquet(ADMIN1_FILEPATH)
-    elif region == "Country":
-        return gpd.read_parquet(COUNTRY_FILEPATH)
-    else:  # UN Subregion
-        return gpd.read_parquet(SUBREGION_FILEPATH)
-
-
-@st.cache_data
-def load_annual_data():
+# Geometries (GeoDataFrames and GeoJSON) are cached as shared resources rather
+# than with st.cache_data, which would pickle and unpickle them on each cache hit
+# Plain DataFrames persist to disk so they survive app restarts. Callers pass the
+# file's modification time so regenerated data is a cache miss, not a stale hit
+@st.cache_data(persist="disk")
+def load_regional_values(region, columns, modified_time):
+    """Load only the requested region id, name and value columns (no geometries)"""
+    return pd.read_parquet(REGION_FILEPATHS[region], columns=list(columns))
+
+
+@st.cache_resource
+def load_regional_geojson(region):
+    """Load the GeoJSON FeatureCollection prebuilt for Plotly during preprocessing"""
+    # Features are keyed by region id so they match locations=map_data[location_col]
+    with gzip.open(REGION_GEOJSON_FILEPATHS[region], "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@st.cache_data(persist="disk")
+def load_top_regions(modified_time):
+    """Load top region rankings precomputed for the bar chart"""
+    return pd.read_parquet(TOP_REGIONS_FILEPATH)
+
+
+@st.cache_data(persist="disk")
+def load_annual_data(modified_time):
     """Load annual global totals for timeseries"""
-    return pd.read_parquet(ANNUAL_GLOBAL_FILEPATH)
+    with open(ANNUAL_GLOBAL_FILEPATH, encoding="utf-8") as f:
+        return pd.DataFrame(json.load(f))
 
 
-@st.cache_data
+# geopandas (with pyproj) is the slowest import in the app and only these loaders
+# need it, so it's imported on first use rather than on every cold start
+@st.cache_resource
 def load_land_outline():
     """Load land outline for continent borders"""
+    import geopandas as gpd
+
     return gpd.read_parquet(LAND_OUTLINE_FILEPATH)
 
 
-# Apply styling
-st.markdown(
+@st.cache_resource
+def load_country_borders():
+    """Load simplified country borders as GeoJSON for the map's line layer"""
+    import geopandas as gpd
+
+    return gpd.read_parquet(COUNTRY_BORDERS_FILEPATH).geometry.__geo_interface__
+
+
+@st.cache_resource
+def validate_value_columns():
+    """Check that every value column the widgets can select exists in each regional file"""
+    # Reads only the parquet schemas, once per process
+    required_cols = set(value_col_map.values())
+    for region, filepath in REGION_FILEPATHS.items():
+        missing_cols = required_cols - set(pq.read_schema(filepath).names)
+        if missing_cols:
+            raise ValueError(
+                f"{filepath} ({region}) is missing value columns: {sorted(missing_cols)}"
+            )
+
+
+@st.cache_resource
+def load_stylesheet():
+    """Load app CSS once, wrapped in a style tag for st.html"""
+    with open(STYLESHEET_FILEPATH, encoding="utf-8") as f:
+        return f"<style>{f.read()}</style>"
+
+
+# Build figures
+# Plotly copies the GeoJSON into every figure, so each cached map holds its own
+# copy (tens of MB for Admin1). Only a few are kept to stay within Streamlit Cloud memory
+@st.cache_resource(max_entries=4, show_spinner=False)
+def build_map_figure(region, variable, normalize, agg_metric, colorbar_max_percentile):
+    """Build the choropleth map for a combination of map controls.
+
+    Assembling the figure around the regional GeoJSON is the slowest part of the
+    app, so recent figures are cached and shared across reruns and sessions.
     """
-    <style>
-    /* Mobile-specific improvements */
-    @media (max-width: 768px) {
-        /* Better spacing for mobile */
-        .main .block-container {
-            padding-left: 1rem !important;
-            padding-right: 1rem !important;
-            padding-top: 1rem !important;
-        }
-
-        /* Make title more readable */
-        h1 {
-            font-size: 1.5rem !important;
-            line-height: 1.3 !important;
-        }
-
-        h2 {
-            font-size: 1.2rem !important;
-        }
-
-        /* Better paragraph spacing */
-        p {
-            font-size: 0.95rem !important;
-            line-height: 1.4 !important;
-        }
-
-        /* Make images responsive */
-        img {
-            max-width: 100% !important;
-            height: auto !important;
-        }
-    }
-    </style>
-""",
-    unsafe_allow_html=True,
-)
+    value_col = value_col_map[(variable, normalize, agg_metric)]
+    title = generate_title(variable, agg_metric, normalize)
+    current_colors = COLOR_PALETTES[variable]
+    colorbar_title = VARIABLE_UNITS.get(variable, "")
+
+    # Determine location and name columns
+    location_col = region_id_map[region]
+    name_col = region_name_map[region]
+
+    # Load data, reading only the id, name and value columns being mapped
+    map_data = load_regional_values(
+        region,
+        tuple(dict.fromkeys([location_col, name_col, value_col])),
+        os.path.getmtime(REGION_FILEPATHS[region]),
+    )
+
+    # Set color range using percentiles to improve contrast
+    vmin = map_data[value_col].quantile(0.05)
+    vmax = map_data[value_col].quantile(colorbar_max_percentile / 100.0)
+
+    # Format hover labels once as plain strings rather than shipping a mixed
+    # object-dtype customdata array for the browser to format
+    # (for UN Subregion the name and code are the same column)
+    hover_text = (
+        "<b>"
+        + map_data[name_col].astype(str)
+        + "</b><br>Code: "
+        + map_data[location_col].astype(str)
+        + "<br>Value: "
+        + map_data[value_col].map("{:.2f}".format)
+    )
+
+    # Create map from a single graph_objects trace, skipping Plotly Express's
+    # DataFrame processing
+    fig = go.Figure(
+        go.Choroplethmap(
+            geojson=load_regional_geojson(region),
+            locations=map_data[location_col].to_numpy(),
+            featureidkey="id",
+            z=map_data[value_col].to_numpy(),
+            colorscale=current_colors,
+            zmin=vmin,
+            zmax=vmax,
+            marker_opacity=1.0,
+            marker_line_width=0.2,
+            marker_line_color="white",
+            hovertext=hover_text.to_numpy(),
+            hovertemplate="%{hovertext}<extra></extra>",
+            # Show units on the colorbar instead of the variable name
+            colorbar_title_text=colorbar_title,
+        )
+    )
+
+    fig.update_layout(
+        PLOT_LAYOUT,
+        title_text=f"{title} by {region}",
+        margin={"r": 0, "t": 50, "l": 0, "b": 0},
+        map_style="white-bg",
+        map_center={"lat": 20, "lon": 0},
+        map_zoom=0.8,
+        # Draw country borders as a line layer rather than a second choropleth
+        # trace, so the borders don't add a data-carrying trace to the figure
+        map_layers=[
+            {
+                "sourcetype": "geojson",
+                "source": load_country_borders(),
+                "type": "line",
+                "color": "#A9A9A9",
+                "line": {"width": 0.5},
+            }
+        ],
+    )
+
+    return fig
+
+
+@st.cache_resource(max_entries=128, show_spinner=False)
+def build_bar_figure(region, variable, normalize, agg_metric, num_regions):
+    """Build the top regions bar chart for a combination of bar chart controls"""
+    # Load precomputed rankings (the bar chart doesn't need the full data)
+    top_regions = load_top_regions(os.path.getmtime(TOP_REGIONS_FILEPATH))
+
+    value_col = value_col_map[(variable, normalize, agg_metric)]
+    title = generate_title(variable, agg_metric, normalize)
+    current_colors = COLOR_PALETTES[variable]
+
+    # Select the top regions, rankings are already sorted by rank
+    mask = (top_regions["region_level"] == region) & (
+        top_regions["value_col"] == value_col
+    )
+    top_n = (
+        top_regions.loc[mask, ["display_name", "value"]]
+        .head(num_regions)
+        .rename(columns={"display_name": "Region", "value": title})
+    )
+
+    # Create bar chart, coloring each bar by its value on the marker itself
+    # rather than through a hidden continuous coloraxis
+    bar_fig = go.Figure(
+        go.Bar(
+            x=top_n[title],
+            y=top_n["Region"],
+            orientation="h",
+            marker={"color": top_n[title], "colorscale": current_colors},
+            hovertemplate="<b>%{y}</b><br>" + title + ": %{x:.2f}<extra></extra>",
+        ),
+        layout=get_bar_layout(title),
+    )
+
+    return bar_fig
+
+
+@st.cache_resource(show_spinner=False)
+def build_timeseries_figure(variable):
+    """Build the annual global totals bar chart for a variable"""
+    # Load data
+    annual_data = load_annual_data(os.path.getmtime(ANNUAL_GLOBAL_FILEPATH))
+
+    # Select column
+    if variable == "Flood Count":
+        ts_col = "flood_count"
+        ts_label = f"Total {variable} by Year"
+    else:
+        base_col, _ = var_map[variable]
+        # COMMENTED OUT - normalization disabled, always use raw values
+        # ts_col = (
+        #     norm_col_name if (normalize and norm_col_name) else base_col
+        # )
+        ts_col = base_col  # Always use raw (non-normalized) column
+        ts_label = f"Total {variable} by Year"
+
+    current_colors = COLOR_PALETTES[variable]
+
+    # Create bar chart, coloring each bar by its value on the marker itself
+    bar_fig = go.Figure(
+        go.Bar(
+            x=annual_data["year"],
+            y=annual_data[ts_col],
+            marker={"color": annual_data[ts_col], "colorscale": current_colors},
+            hovertemplate="Year=%{x}<br>" + ts_label + "=%{y}<extra></extra>",
+        )
+    )
+
+    bar_fig.update_layout(
+        PLOT_LAYOUT,
+        title_text=ts_label,
+        xaxis={"title": "Year", "showgrid": True, "gridcolor": GRID_COLOR},
+        yaxis={"title": ts_label, "showgrid": True, "gridcolor": GRID_COLOR},
+    )
+
+    return bar_fig
+
+
+# Apply styling
+st.html(load_stylesheet())
 
 # Main content
 st.title(f"Global Flood Analysis Dashboard")
@@ -222,21 +513,8 @@ st.markdown(
     "Click through the tabs to find more information about the project and explore flood impacts and characteristics by region, time, and variable."
 )
 
-# Helper mappings
-var_map = {
-    "Economic Damages": ("damages", "damages_norm"),
-    "Population Affected": ("pop_affected", "pop_affected_norm"),
-    "Flooded Area": ("flooded_area", "flooded_area_norm"),
-    "Flood Count": (None, None),
-    "Avg Precipitation (Flood)": ("avg_precip", None),
-    "Avg 75th Percentile Precipitation (Flood)": ("extreme_precip_75", None),
-}
-
-region_id_map = {
-    "Admin1 (States/Provinces)": "adm1_code",
-    "Country": "ISO",
-    "UN Subregion": "UN Subregion",
-}
+# Fail at startup rather than on a KeyError during user interaction
+validate_value_columns()
 
 # Create navigation
 view = st.selectbox(
@@ -257,14 +535,7 @@ if view == "Map View":
         with col1:
             variable = st.selectbox(
                 "Variable",
-                [
-                    "Economic Damages",
-                    "Population Affected",
-                    "Flooded Area",
-                    "Flood Count",
-                    "Avg Precipitation (Flood)",
-                    "Avg 75th Percentile Precipitation (Flood)",
-                ],
+                VARIABLE_OPTIONS,
                 index=0,
                 key="map_variable",
             )
@@ -278,33 +549,19 @@ if view == "Map View":
 
             region = st.selectbox(
                 "Geographic Level",
-                ["Admin1 (States/Provinces)", "Country", "UN Subregion"],
+                REGION_OPTIONS,
                 index=1,
                 key="map_region",
             )
 
             # Adjust statistic options based on variable type
-            precip_vars = [
-                "Avg Precipitation (Flood)",
-                "Avg 75th Percentile Precipitation (Flood)",
-            ]
-
             if variable == "Flood Count":
                 st.text("Statistic: Total Count")
                 agg_metric = "Sum"  # Not used, but defined for consistency
-            elif variable in precip_vars:
-                # For precipitation, Sum doesn't make sense
-                agg_metric = st.selectbox(
-                    "Statistic",
-                    ["Mean", "Median", "Max"],
-                    index=0,
-                    key="map_agg",
-                )
             else:
-                # For other variables, all statistics are valid
                 agg_metric = st.selectbox(
                     "Statistic",
-                    ["Mean", "Median", "Max", "Sum"],
+                    VALID_STATS[variable],
                     index=0,
                     key="map_agg",
                 )
@@ -323,107 +580,11 @@ if view == "Map View":
             )
 
         with col2:
-            # Load data
-            geo_data = load_regional_data(region)
-
-            # Build column name
-            if variable == "Flood Count":
-                value_col = "flood_count"
-            else:
-                base_col, norm_col = var_map[variable]
-                base_name = norm_col if (normalize and norm_col) else base_col
-                value_col = f"{base_name}_{agg_metric.lower()}"
-
-            title = generate_title(variable, agg_metric, normalize)
-            current_colors = COLOR_PALETTES[variable]
-
-            # Define units for colorbar
-            variable_units = {
-                "Economic Damages": "USD",
-                "Population Affected": "People",
-                "Flooded Area": "km²",
-                "Flood Count": "Events",
-                "Avg Precipitation (Flood)": "mm/day",
-                "Avg 75th Percentile Precipitation (Flood)": "mm/day",
-            }
-            colorbar_title = variable_units.get(variable, "")
-
-            # Determine location and name columns
-            location_col = region_id_map[region]
-            if region == "Admin1 (States/Provinces)":
-                name_col = "Admin1 (States/Provinces)"
-            elif region == "Country":
-                name_col = "Country"
-            else:
-                name_col = "UN Subregion"
-
-            with st.spinner("Loading map (expect 10-15 second lag)..."):
-                # Load country boundaries
-                country_borders = gpd.read_parquet(COUNTRY_FILEPATH)
-
-                # Set color range using percentiles to improve contrast
-                vmin = geo_data[value_col].quantile(0.05)
-                vmax = geo_data[value_col].quantile(colorbar_max_percentile / 100.0)
-
-                # Create map
-                fig = px.choropleth_mapbox(
-                    geo_data,
-                    geojson=geo_data.geometry,
-                    locations=geo_data.index,
-                    color=value_col,
-                    color_continuous_scale=current_colors,
-                    range_color=[vmin, vmax],
-                    mapbox_style="white-bg",
-                    center={"lat": 20, "lon": 0},
-                    zoom=0.8,
-                    opacity=1.0,
+            with st.spinner("Loading map..."):
+                fig = build_map_figure(
+                    region, variable, normalize, agg_metric, colorbar_max_percentile
                 )
-
-                fig.update_traces(marker_line_width=0.2, marker_line_color="white")
-
-                # Add hover
-                if name_col in geo_data.columns:
-                    customdata = np.column_stack(
-                        [
-                            geo_data[name_col],
-                            geo_data[location_col],
-                            geo_data[value_col],
-                        ]
-                    )
-                    hover_template = "<b>%{customdata[0]}</b><br>Code: %{customdata[1]}<br>Value: %{customdata[2]:.2f}<extra></extra>"
-                    fig.update_traces(
-                        customdata=customdata, hovertemplate=hover_template
-                    )
-
-                # Add country borders
-                country_trace = px.choropleth_mapbox(
-                    country_borders,
-                    geojson=country_borders.geometry,
-                    locations=country_borders.index,
-                    color_discrete_sequence=["rgba(0,0,0,0)"],
-                    mapbox_style="white-bg",
-                ).data[0]
-
-                country_trace.marker.line.width = 0.5
-                country_trace.marker.line.color = "#A9A9A9"
-                country_trace.showlegend = False
-                country_trace.hoverinfo = "skip"
-                country_trace.hovertemplate = None
-
-                fig.add_trace(country_trace)
-
-                fig.update_layout(
-                    height=PLOT_HEIGHT,
-                    autosize=True,
-                    font=dict(color=HEADER_COLOR),
-                    title=get_plot_title_config(f"{title} by {region}"),
-                    margin={"r": 0, "t": 50, "l": 0, "b": 0},
-                )
-
-                # Update colorbar to show units instead of variable name
-                fig.update_coloraxes(colorbar_title_text=colorbar_title)
-
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, key="map_chart")
 
     map_fragment()
 
@@ -439,14 +600,7 @@ elif view == "Top Regions":
         with col1:
             variable = st.selectbox(
                 "Variable",
-                [
-                    "Economic Damages",
-                    "Population Affected",
-                    "Flooded Area",
-                    "Flood Count",
-                    "Avg Precipitation (Flood)",
-                    "Avg 75th Percentile Precipitation (Flood)",
-                ],
+                VARIABLE_OPTIONS,
                 index=0,
                 key="bar_variable",
             )
@@ -460,33 +614,19 @@ elif view == "Top Regions":
 
             region = st.selectbox(
                 "Geographic Level",
-                ["Admin1 (States/Provinces)", "Country", "UN Subregion"],
+                REGION_OPTIONS,
                 index=0,
                 key="bar_region",
             )
 
             # Adjust statistic options based on variable type
-            precip_vars = [
-                "Avg Precipitation (Flood)",
-                "Avg 75th Percentile Precipitation (Flood)",
-            ]
-
             if variable == "Flood Count":
                 st.text("Statistic: Total Count")
                 agg_metric = "Sum"  # Not used, but defined for consistency
-            elif variable in precip_vars:
-                # For precipitation, Sum doesn't make sense
-                agg_metric = st.selectbox(
-                    "Statistic",
-                    ["Mean", "Median", "Max"],
-                    index=0,
-                    key="bar_agg",
-                )
             else:
-                # For other variables, all statistics are valid
                 agg_metric = st.selectbox(
                     "Statistic",
-                    ["Mean", "Median", "Max", "Sum"],
+                    VALID_STATS[variable],
                     index=0,
                     key="bar_agg",
                 )
@@ -502,101 +642,10 @@ elif view == "Top Regions":
             )
 
         with col2:
-            # Load data
-            geo_data = load_regional_data(region)
-
-            # Build column name
-            if variable == "Flood Count":
-                value_col = "flood_count"
-            else:
-                base_col, norm_col = var_map[variable]
-                base_name = norm_col if (normalize and norm_col) else base_col
-                value_col = f"{base_name}_{agg_metric.lower()}"
-
-            title = generate_title(variable, agg_metric, normalize)
-            current_colors = COLOR_PALETTES[variable]
-
-            # Determine display names
-            if region == "Admin1 (States/Provinces)":
-                if (
-                    "Admin1 (States/Provinces)" in geo_data.columns
-                    and "Country" in geo_data.columns
-                ):
-                    geo_data_copy = geo_data.copy()
-                    geo_data_copy["Display Name"] = (
-                        geo_data_copy["Admin1 (States/Provinces)"].astype(str)
-                        + ", "
-                        + geo_data_copy["Country"].astype(str)
-                    )
-                    display_col = "Display Name"
-                    top_n = (
-                        geo_data_copy[[display_col, value_col]]
-                        .nlargest(num_regions, value_col)
-                        .copy()
-                    )
-                else:
-                    display_col = region_id_map[region]
-                    top_n = (
-                        geo_data[[display_col, value_col]]
-                        .nlargest(num_regions, value_col)
-                        .copy()
-                    )
-            elif region == "Country":
-                display_col = (
-                    "Country"
-                    if "Country" in geo_data.columns
-                    else region_id_map[region]
-                )
-                top_n = (
-                    geo_data[[display_col, value_col]]
-                    .nlargest(num_regions, value_col)
-                    .copy()
-                )
-            else:
-                display_col = (
-                    "UN Subregion"
-                    if "UN Subregion" in geo_data.columns
-                    else region_id_map[region]
-                )
-                top_n = (
-                    geo_data[[display_col, value_col]]
-                    .nlargest(num_regions, value_col)
-                    .copy()
-                )
-
-            top_n.columns = ["Region", title]
-            top_n = top_n.reset_index(drop=True)
-            top_n.index = top_n.index + 1
-
-            # Create bar chart
-            bar_fig = px.bar(
-                top_n,
-                x=title,
-                y="Region",
-                orientation="h",
-                color=title,
-                color_continuous_scale=current_colors,
-                labels={title: title, "Region": ""},
-            )
-
-            bar_fig.update_layout(
-                height=PLOT_HEIGHT,
-                autosize=True,
-                showlegend=False,
-                yaxis={"categoryorder": "total ascending"},
-                font=dict(color=HEADER_COLOR),
-                plot_bgcolor=PLOT_BG_COLOR,
-                paper_bgcolor=PLOT_BG_COLOR,
-                title=get_plot_title_config(title),
-                coloraxis_showscale=False,
-                margin={"l": 10, "r": 10, "t": 50, "b": 10},
-            )
-
-            bar_fig.update_traces(
-                hovertemplate="<b>%{y}</b><br>" + title + ": %{x:.2f}<extra></extra>"
+            bar_fig = build_bar_figure(
+                region, variable, normalize, agg_metric, num_regions
             )
-
-            st.plotly_chart(bar_fig, use_container_width=True)
+            st.plotly_chart(bar_fig, use_container_width=True, key="bar_chart")
 
     bar_fragment()
 
@@ -612,12 +661,7 @@ elif view == "Global Annual Trends":
         with col1:
             variable = st.selectbox(
                 "Variable",
-                [
-                    "Economic Damages",
-                    "Population Affected",
-                    "Flooded Area",
-                    "Flood Count",
-                ],
+                TIMESERIES_VARIABLE_OPTIONS,
                 index=0,
                 key="ts_variable",
             )
@@ -627,50 +671,8 @@ elif view == "Global Annual Trends":
             normalize = False
 
         with col2:
-            # Load data
-            annual_data = load_annual_data()
-
-            # Select column
-            if variable == "Flood Count":
-                ts_col = "flood_count"
-                ts_label = f"Total {variable} by Year"
-            else:
-                base_col, _ = var_map[variable]
-                # COMMENTED OUT - normalization disabled, always use raw values
-                # ts_col = (
-                #     norm_col_name if (normalize and norm_col_name) else base_col
-                # )
-                ts_col = base_col  # Always use raw (non-normalized) column
-                ts_label = f"Total {variable} by Year"
-
-            current_colors = COLOR_PALETTES[variable]
-
-            # Create bar chart
-            bar_fig = px.bar(
-                annual_data,
-                x="year",
-                y=ts_col,
-                labels={"year": "Year", ts_col: ts_label},
-                color=ts_col,
-                color_continuous_scale=current_colors,
-            )
-
-            bar_fig.update_layout(
-                height=PLOT_HEIGHT,
-                autosize=True,
-                font=dict(color=HEADER_COLOR),
-                plot_bgcolor=PLOT_BG_COLOR,
-                paper_bgcolor=PLOT_BG_COLOR,
-                showlegend=False,
-                title=get_plot_title_config(ts_label),
-                coloraxis_showscale=False,
-                margin={"l": 10, "r": 10, "t": 50, "b": 10},
-            )
-
-            bar_fig.update_xaxes(showgrid=True, gridcolor=GRID_COLOR)
-            bar_fig.update_yaxes(showgrid=True, gridcolor=GRID_COLOR)
-
-            st.plotly_chart(bar_fig, use_container_width=True)
+            bar_fig = build_timeseries_figure(variable)
+            st.plotly_chart(bar_fig, use_container_width=True, key="timeseries_chart")
 
     timeseries_fragment()
 
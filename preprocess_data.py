@@ -3,8 +3,14 @@ Preprocess data for use in Streamlit app
 
 """
 
+import gzip
+import json
+import os
+
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
 
 # Dictionary mapping problematic adm1_codes to correct countries per GAUL
 # These codes appear in multiple countries in the source data but should be assigned to one country
@@ -53,16 +59,183 @@ OUTPUT_DATA_DIR = "./data/preprocessed/"
 ADMIN1_AGGREGATED_FILEPATH = f"{OUTPUT_DATA_DIR}app_admin1_aggregated.parquet"
 COUNTRY_AGGREGATED_FILEPATH = f"{OUTPUT_DATA_DIR}app_country_aggregated.parquet"
 SUBREGION_AGGREGATED_FILEPATH = f"{OUTPUT_DATA_DIR}app_subregion_aggregated.parquet"
-ANNUAL_GLOBAL_FILEPATH = f"{OUTPUT_DATA_DIR}app_annual_global_totals.parquet"
+ANNUAL_GLOBAL_FILEPATH = f"{OUTPUT_DATA_DIR}app_annual_global_totals.json"
 LAND_OUTLINE_FILEPATH = f"{OUTPUT_DATA_DIR}app_land_outline.parquet"
+TOP_REGIONS_FILEPATH = f"{OUTPUT_DATA_DIR}app_top_regions.parquet"
+COUNTRY_BORDERS_FILEPATH = f"{OUTPUT_DATA_DIR}app_country_borders.parquet"
+ADMIN1_GEOJSON_FILEPATH = f"{OUTPUT_DATA_DIR}app_admin1_boundaries.geojson.gz"
+COUNTRY_GEOJSON_FILEPATH = f"{OUTPUT_DATA_DIR}app_country_boundaries.geojson.gz"
+SUBREGION_GEOJSON_FILEPATH = f"{OUTPUT_DATA_DIR}app_subregion_boundaries.geojson.gz"
+
+# Outputs are only rebuilt when an input (or this script) is newer than them
+# Delete an output to force a rebuild
+INPUT_FILEPATHS = [
+    GAUL_L1_FILEPATH,
+    UNSD_M49_FILEPATH,
+    COUNTRY_BOUNDARIES_FILEPATH,
+    LAND_FILEPATH,
+    FLOOD_CSV_FILEPATH,
+]
+OUTPUT_FILEPATHS = [
+    ADMIN1_AGGREGATED_FILEPATH,
+    COUNTRY_AGGREGATED_FILEPATH,
+    SUBREGION_AGGREGATED_FILEPATH,
+    ANNUAL_GLOBAL_FILEPATH,
+    LAND_OUTLINE_FILEPATH,
+    TOP_REGIONS_FILEPATH,
+    COUNTRY_BORDERS_FILEPATH,
+    ADMIN1_GEOJSON_FILEPATH,
+    COUNTRY_GEOJSON_FILEPATH,
+    SUBREGION_GEOJSON_FILEPATH,
+]
+
+# Grid size (degrees) that exported coordinates are rounded to, ~0.0001 ≈ 11m
+COORDINATE_GRID_SIZE = 1e-4
+
+# Map display simplification: polygon parts smaller than MIN_POLYGON_AREA
+# (deg², ~0.1 km²) are dropped and outlines simplified to SIMPLIFY_TOLERANCE
+# (degrees, ~1 km). Tiny coastal islands hold most admin1 vertices but can't be seen
+MIN_POLYGON_AREA = 1e-5
+SIMPLIFY_TOLERANCE = 0.01
+
+# UN subregions span continents, so a looser tolerance (~5 km) is still invisible
+SUBREGION_SIMPLIFY_TOLERANCE = 0.05
+
+# Number of top regions to rank (max of the "Number of regions" slider in the app)
+MAX_TOP_REGIONS = 30
+
+# zstd gives smaller files than the default snappy at similar read speed, a high
+# level only slows the one-off write
+PARQUET_COMPRESSION = "zstd"
+PARQUET_COMPRESSION_LEVEL = 9
+
+# Simplification tolerance (degrees) for the map's country borders overlay
+BORDER_SIMPLIFY_TOLERANCE = 0.05
+
+
+def latest_modified_time(path):
+    """Modification time of a file, or of the newest file in a directory."""
+    if os.path.isdir(path):
+        return max(
+            (entry.stat().st_mtime for entry in os.scandir(path)),
+            default=os.path.getmtime(path),
+        )
+    return os.path.getmtime(path)
+
+
+def needs_rebuild(source_paths, output_paths):
+    """Check whether any output is missing or older than one of its sources."""
+    if not all(os.path.exists(path) for path in output_paths):
+        return True
+    oldest_output = min(os.path.getmtime(path) for path in output_paths)
+    return any(latest_modified_time(path) > oldest_output for path in source_paths)
+
+
+def aggregate_metrics(groups, metrics, agg_funcs):
+    """Apply every aggregation function to every metric and count floods per group."""
+    # Named aggregations give flat column names directly: e.g., 'damages_mean'
+    named_aggs = {
+        f"{metric}_{func}": (metric, func) for metric in metrics for func in agg_funcs
+    }
+
+    # "size" counts every row, including those with missing metric values
+    named_aggs["flood_count"] = (metrics[0], "size")
+    return groups.agg(**named_aggs)
+
+
+def build_top_regions(level_data, value_cols, max_regions=MAX_TOP_REGIONS):
+    """Rank the largest regions for each value column at each geographic level.
+
+    level_data maps each geographic level to (aggregated data, display column).
+    """
+    rankings = []
+    for region_level, (df, display_col) in level_data.items():
+        for value_col in value_cols:
+            top = (
+                df[[display_col, value_col]]
+                .dropna(subset=[value_col])
+                .nlargest(max_regions, value_col)
+            )
+            rankings.append(
+                pd.DataFrame(
+                    {
+                        "region_level": region_level,
+                        "value_col": value_col,
+                        "rank": range(1, len(top) + 1),
+                        "display_name": top[display_col].astype(str).to_numpy(),
+                        "value": top[value_col].astype(float).to_numpy(),
+                    }
+                )
+            )
+    return pd.concat(rankings, ignore_index=True)
+
+
+def simplify_geometry(
+    geometry, tolerance=SIMPLIFY_TOLERANCE, min_area=MIN_POLYGON_AREA
+):
+    """Simplify polygons for map display, dropping parts too small to see.
+
+    The largest part of each geometry is always kept so no region disappears.
+    """
+    parts, index = shapely.get_parts(geometry, return_index=True)
+    areas = shapely.area(parts)
+    keep = areas >= min_area
+
+    # Order parts by geometry then descending area, the first of each is its largest
+    order = np.lexsort((-areas, index))
+    is_largest = np.r_[True, index[order][1:] != index[order][:-1]]
+    keep[order[is_largest]] = True
+
+    # Writing into a full-length array keeps missing geometries as None
+    merged = shapely.multipolygons(
+        parts[keep], indices=index[keep], out=np.empty(len(geometry), dtype=object)
+    )
+    return shapely.simplify(merged, tolerance, preserve_topology=True)
+
+
+def build_country_borders(country_gdf, tolerance=BORDER_SIMPLIFY_TOLERANCE):
+    """Merge country outlines into one simplified line geometry for the borders overlay.
+
+    Shared borders are unioned first so each one is simplified (and drawn) only once.
+    """
+    borders = shapely.line_merge(shapely.union_all(country_gdf.geometry.boundary.array))
+    return gpd.GeoDataFrame(
+        geometry=[shapely.simplify(borders, tolerance)], crs=country_gdf.crs
+    )
+
+
+def export_parquet(df, filepath):
+    """Write a DataFrame or GeoDataFrame to zstd-compressed parquet."""
+    df.to_parquet(
+        filepath,
+        index=False,
+        compression=PARQUET_COMPRESSION,
+        compression_level=PARQUET_COMPRESSION_LEVEL,
+    )
+
+
+def export_geojson(gdf, id_col, filepath):
+    """Write region boundaries as gzipped GeoJSON with features keyed by region id.
+
+    The app loads these directly for the map instead of converting geometries at runtime.
+    """
+    with gzip.open(filepath, "wt", encoding="utf-8") as f:
+        f.write(gdf.set_index(id_col).geometry.to_json(show_bbox=False))
 
 
 def main():
     """Main preprocessing pipeline for GAUL L1 boundaries."""
 
+    if not needs_rebuild(INPUT_FILEPATHS + [__file__], OUTPUT_FILEPATHS):
+        print("✓ Preprocessed data is up to date, nothing to rebuild")
+        return
+
     ## ====== Read in data ======
     print("Loading GAUL L1 (admin1) boundaries...")
-    gaul_l1 = gpd.read_file(GAUL_L1_FILEPATH)
+    # Only read the attribute fields that are kept, geometry is always included
+    gaul_l1 = gpd.read_file(
+        GAUL_L1_FILEPATH, engine="pyogrio", use_arrow=True, columns=["ADM1_CODE"]
+    )
     print(f"✓ Loaded")
 
     print("Loading M49 United Nations Statistics Division table...")
@@ -70,35 +243,20 @@ def main():
     print(f"✓ Loaded")
 
     print("Loading natural earth boundary shapefile...")
-    countries_gdf = gpd.read_file(COUNTRY_BOUNDARIES_FILEPATH)
+    countries_gdf = gpd.read_file(
+        COUNTRY_BOUNDARIES_FILEPATH,
+        engine="pyogrio",
+        use_arrow=True,
+        columns=["ISO_A3"],
+    )
     print(f"✓ Loaded")
 
     print("Loading natural earth land shapefile...")
-    land_gdf = gpd.read_file(LAND_FILEPATH)
+    land_gdf = gpd.read_file(LAND_FILEPATH, engine="pyogrio", use_arrow=True)
     print(f"✓ Loaded")
 
     print("Loading flood dataset...")
-    flood_df = pd.read_csv(FLOOD_CSV_FILEPATH)
-    print(f"✓ Loaded")
-
-    ## ====== Preprocess GAUL data =====
-
-    print("Preprocessing GAUL L1 data...")
-    gaul_l1.rename(
-        columns={"ADM1_CODE": "adm1_code"}, inplace=True
-    )  # Rename column to match flood_df
-    gaul_l1 = gaul_l1[["adm1_code", "geometry"]]  # Get only necessary columns
-
-    # Simplify geometries for faster rendering (tolerance in degrees, ~0.1 ≈ 11km)
-    print("Simplifying Admin1 geometries...")
-    gaul_l1["geometry"] = gaul_l1["geometry"].simplify(
-        tolerance=0.1, preserve_topology=True
-    )
-    print(f"✓ Complete")
-
-    ## ====== Preprocess flood dataset =====
-
-    # Subset table to get columns needed in app only
+    # Only parse the columns needed in app, using the multithreaded pyarrow parser
     app_cols = [
         "id",
         "mon-yr-adm1-id",
@@ -117,17 +275,28 @@ def main():
         "event_precip_mean (mm/day)",
         "event_precip_75_quant_mean (mm/day)",
     ]
-    flood_df_subset = flood_df[app_cols].copy()
+    flood_df_subset = pd.read_csv(
+        FLOOD_CSV_FILEPATH, usecols=app_cols, engine="pyarrow"
+    )
+    print(f"✓ Loaded")
+
+    ## ====== Preprocess GAUL data =====
+
+    print("Preprocessing GAUL L1 data...")
+    gaul_l1.rename(
+        columns={"ADM1_CODE": "adm1_code"}, inplace=True
+    )  # Rename column to match flood_df
+    gaul_l1 = gaul_l1[["adm1_code", "geometry"]]  # Get only necessary columns
+
+    ## ====== Preprocess flood dataset =====
 
     # Drop all rows with missing time info
     flood_df_subset = flood_df_subset.dropna(subset=["mon-yr"])
 
     # Correct country assignments for problematic admin1 codes
     print("Correcting country assignments for admin1 codes where theres a mismatch between EM-DAT and GAUL...")
-    for code, correct_country in COUNTRY_CORRECTIONS.items():
-        mask = flood_df_subset["adm1_code"] == code
-        if mask.any():
-            flood_df_subset.loc[mask, "Country"] = correct_country
+    corrected_country = flood_df_subset["adm1_code"].map(COUNTRY_CORRECTIONS)
+    flood_df_subset["Country"] = corrected_country.fillna(flood_df_subset["Country"])
     print(f"✓ Corrected {len(COUNTRY_CORRECTIONS)} admin1 codes")
 
     # Rename columns for better readibility in app
@@ -151,7 +320,14 @@ def main():
     flood_df_subset["damages"] = flood_df_subset["damages"] * 1000
 
     # Add year column
-    flood_df_subset["year"] = flood_df_subset["mon-yr"].str[-4:].astype(int)
+    # Parse each unique month-year label once, then broadcast back to the rows
+    mon_yr_codes, mon_yr_labels = pd.factorize(flood_df_subset["mon-yr"])
+    flood_df_subset["year"] = mon_yr_labels.str[-4:].astype(int)[mon_yr_codes]
+
+    # Group by string keys as categories so groupby hashes integer codes
+    # Name columns stay strings, they're relabelled and concatenated below
+    for key in ["ISO", "UN Subregion"]:
+        flood_df_subset[key] = flood_df_subset[key].astype("category")
 
     ## ====== Preprocess country boundaries =====
 
@@ -175,12 +351,23 @@ def main():
     m49_gdf = m49_df.merge(countries_subset[["ISO", "geometry"]], on="ISO", how="left")
     m49_gdf = gpd.GeoDataFrame(m49_gdf)
 
-    # Merge country geometries by subregion
+    # Merge country geometries by subregion, one GEOS union per subregion
+    # Unioning on the subregion simplification grid snaps away slivers between
+    # neighbouring countries and leaves fewer vertices to merge
     # Drop countries with NaN for geometry
-    m49_subregion_gdf = (
-        m49_gdf[["Subregion", "geometry"]]
-        .dropna(subset=["geometry"])
-        .dissolve(by="Subregion")
+    countries_with_geometry = m49_gdf[["Subregion", "geometry"]].dropna(
+        subset=["geometry"]
+    )
+    subregion_geometries = {
+        subregion: shapely.union_all(
+            group.geometry.array, grid_size=SUBREGION_SIMPLIFY_TOLERANCE
+        )
+        for subregion, group in countries_with_geometry.groupby("Subregion")
+    }
+    m49_subregion_gdf = gpd.GeoDataFrame(
+        geometry=list(subregion_geometries.values()),
+        index=pd.Index(list(subregion_geometries), name="Subregion"),
+        crs=m49_gdf.crs,
     )
 
     ## ====== Aggregate flood data by geographic level ======
@@ -203,76 +390,69 @@ def main():
     print("Aggregating flood data at Admin1 level...")
 
     # Group by admin1 and compute all metrics
-    admin1_agg = (
-        flood_df_subset.groupby("adm1_code")[metrics].agg(agg_funcs).reset_index()
+    admin1_groups = flood_df_subset.groupby("adm1_code")
+    admin1_agg = aggregate_metrics(admin1_groups, metrics, agg_funcs)
+
+    # Add region name and country name for display, both from the same row: the
+    # first named one for each admin1 if there is one. Country keeps any correction
+    # from COUNTRY_CORRECTIONS, so it can differ from the Country level's ISO name
+    name_cols = ["adm1_code", "Admin1 (States/Provinces)", "Country"]
+    unnamed = flood_df_subset["Admin1 (States/Provinces)"].isna().to_numpy()
+    admin1_names = (
+        flood_df_subset[name_cols]
+        .iloc[np.argsort(unnamed, kind="stable")]
+        .drop_duplicates(subset=["adm1_code"])
+        .set_index("adm1_code")
     )
 
-    # Flatten column names: e.g., ('damages', 'mean') -> 'damages_mean'
-    admin1_agg.columns = ["adm1_code"] + [
-        f"{metric}_{func}" for metric in metrics for func in agg_funcs
-    ]
-
-    # Add flood count
-    admin1_count = (
-        flood_df_subset.groupby("adm1_code").size().reset_index(name="flood_count")
-    )
-    admin1_agg = admin1_agg.merge(admin1_count, on="adm1_code")
-
-    # Add region name and country name for display
-    admin1_names = flood_df_subset[
-        ["adm1_code", "Admin1 (States/Provinces)", "Country"]
-    ].drop_duplicates(subset=["adm1_code"])
-    admin1_agg = admin1_agg.merge(admin1_names, on="adm1_code", how="left")
+    # The aggregates stay indexed by adm1_code so this joins on the index
+    admin1_agg = admin1_agg.join(admin1_names)
 
     # Replace None or "Administrative region not available" with "Unknown Name (code: [code])"
     mask = (admin1_agg["Admin1 (States/Provinces)"].isna()) | (
         admin1_agg["Admin1 (States/Provinces)"] == "Administrative unit not available"
     )
     admin1_agg.loc[mask, "Admin1 (States/Provinces)"] = (
-        "Unknown Name (code: "
-        + admin1_agg.loc[mask, "adm1_code"].astype(int).astype(str)
-        + ")"
+        "Unknown Name (code: " + admin1_agg.index[mask].astype(int).astype(str) + ")"
+    )
+
+    # Add "Admin1, Country" label so the app doesn't build it on every interaction
+    admin1_agg["Display Name"] = (
+        admin1_agg["Admin1 (States/Provinces)"] + ", " + admin1_agg["Country"]
     )
 
     # Merge with geometries
-    admin1_final = gaul_l1.merge(admin1_agg, on="adm1_code", how="inner")
+    admin1_final = gaul_l1.join(admin1_agg, on="adm1_code", how="inner")
     print(f"✓ Complete ({len(admin1_final)} regions)")
 
     print("Aggregating flood data at Country level...")
-    country_agg = flood_df_subset.groupby("ISO")[metrics].agg(agg_funcs).reset_index()
-    country_agg.columns = ["ISO"] + [
-        f"{metric}_{func}" for metric in metrics for func in agg_funcs
-    ]
-    country_count = (
-        flood_df_subset.groupby("ISO").size().reset_index(name="flood_count")
+    country_agg = aggregate_metrics(
+        flood_df_subset.groupby("ISO", observed=True), metrics, agg_funcs
     )
-    country_agg = country_agg.merge(country_count, on="ISO")
 
     # Add country name for hover display
-    country_names = flood_df_subset[["ISO", "Country"]].drop_duplicates()
-    country_agg = country_agg.merge(country_names, on="ISO", how="left")
-    country_final = countries_subset.merge(country_agg, on="ISO", how="inner")
+    # Use each ISO's most frequent name, a few admin1 rows carry another one (e.g.
+    # "Jammu and Kashmir" under IND and PAK) which would otherwise duplicate countries
+    country_names = (
+        flood_df_subset.value_counts(["ISO", "Country"])
+        .reset_index()
+        .drop_duplicates(subset=["ISO"])
+        .set_index("ISO")["Country"]
+    )
+    country_agg = country_agg.join(country_names)
+    country_final = countries_subset.join(country_agg, on="ISO", how="inner")
     print(f"✓ Complete ({len(country_final)} countries)")
 
     print("Aggregating flood data at UN Subregion level...")
-    subregion_agg = (
-        flood_df_subset.groupby("UN Subregion")[metrics].agg(agg_funcs).reset_index()
-    )
-    subregion_agg.columns = ["UN Subregion"] + [
-        f"{metric}_{func}" for metric in metrics for func in agg_funcs
-    ]
-    subregion_count = (
-        flood_df_subset.groupby("UN Subregion").size().reset_index(name="flood_count")
+    subregion_agg = aggregate_metrics(
+        flood_df_subset.groupby("UN Subregion", observed=True), metrics, agg_funcs
     )
-    subregion_agg = subregion_agg.merge(subregion_count, on="UN Subregion")
-
-    # Reset index on m49_subregion_gdf to get Subregion as a column
-    m49_subregion_gdf_reset = m49_subregion_gdf.reset_index()
 
-    # Rename to match the flood data column name
-    m49_subregion_gdf_reset.rename(columns={"Subregion": "UN Subregion"}, inplace=True)
-    subregion_final = m49_subregion_gdf_reset.merge(
-        subregion_agg, on="UN Subregion", how="inner"
+    # Both sides are indexed by subregion, rename to match the flood data column name
+    subregion_final = (
+        m49_subregion_gdf.join(subregion_agg, how="inner")
+        .rename_axis("UN Subregion")
+        .reset_index()
     )
     print(f"✓ Complete ({len(subregion_final)} subregions)")
 
@@ -281,37 +461,94 @@ def main():
     print("Creating annual global totals...")
 
     # Sum all metrics by year
-    annual_global = flood_df_subset.groupby("year")[metrics].sum().reset_index()
+    annual_groups = flood_df_subset.groupby("year")
+    annual_global = annual_groups[metrics].sum()
 
     # Add flood count
-    annual_count = (
-        flood_df_subset.groupby("year").size().reset_index(name="flood_count")
-    )
-    annual_global = annual_global.merge(annual_count, on="year")
+    annual_global["flood_count"] = annual_groups.size()
+    annual_global = annual_global.reset_index()
     print(f"✓ Complete ({len(annual_global)} years)")
 
+    ## ====== Rank top regions for bar chart ======
+
+    print("Ranking top regions...")
+    value_cols = [f"{metric}_{func}" for metric in metrics for func in agg_funcs]
+    top_regions = build_top_regions(
+        {
+            "Admin1 (States/Provinces)": (admin1_final, "Display Name"),
+            "Country": (country_final, "Country"),
+            "UN Subregion": (subregion_final, "UN Subregion"),
+        },
+        value_cols + ["flood_count"],
+    )
+    print(f"✓ Complete ({len(top_regions)} rows)")
+
+    print("Simplifying country borders...")
+    country_borders = build_country_borders(country_final)
+    print("✓ Complete")
+
     ## ====== Export data ======
 
+    # Store region names as categoricals so they round-trip as dictionary-encoded
+    # columns and the app reads them back as integer codes rather than strings
+    region_name_cols = ["ISO", "Country", "UN Subregion", "Admin1 (States/Provinces)"]
+    for final_df, tolerance in [
+        (admin1_final, SIMPLIFY_TOLERANCE),
+        (country_final, SIMPLIFY_TOLERANCE),
+        (subregion_final, SUBREGION_SIMPLIFY_TOLERANCE),
+    ]:
+        cols = [col for col in region_name_cols if col in final_df.columns]
+        final_df[cols] = final_df[cols].astype("category")
+
+        # The only simplification pass for each level: tiny islands are dropped
+        # first so full-resolution GAUL is cheap to simplify, then coordinates are
+        # rounded, shrinking the GeoJSON sent to the browser
+        # "pointwise" only snaps vertices; the default mode fails on some polygons
+        final_df["geometry"] = shapely.set_precision(
+            simplify_geometry(final_df.geometry.array, tolerance),
+            grid_size=COORDINATE_GRID_SIZE,
+            mode="pointwise",
+        )
+
     print(f"Exporting Admin1 aggregated data to {ADMIN1_AGGREGATED_FILEPATH}...")
-    admin1_final.to_parquet(ADMIN1_AGGREGATED_FILEPATH, index=False)
+    export_parquet(admin1_final, ADMIN1_AGGREGATED_FILEPATH)
     print("✓ Exported")
 
     print(f"Exporting Country aggregated data to {COUNTRY_AGGREGATED_FILEPATH}...")
-    country_final.to_parquet(COUNTRY_AGGREGATED_FILEPATH, index=False)
+    export_parquet(country_final, COUNTRY_AGGREGATED_FILEPATH)
     print("✓ Exported")
 
     print(
         f"Exporting UN Subregion aggregated data to {SUBREGION_AGGREGATED_FILEPATH}..."
     )
-    subregion_final.to_parquet(SUBREGION_AGGREGATED_FILEPATH, index=False)
+    export_parquet(subregion_final, SUBREGION_AGGREGATED_FILEPATH)
     print("✓ Exported")
 
+    for final_df, id_col, geojson_filepath in [
+        (admin1_final, "adm1_code", ADMIN1_GEOJSON_FILEPATH),
+        (country_final, "ISO", COUNTRY_GEOJSON_FILEPATH),
+        (subregion_final, "UN Subregion", SUBREGION_GEOJSON_FILEPATH),
+    ]:
+        print(f"Exporting map boundaries to {geojson_filepath}...")
+        export_geojson(final_df, id_col, geojson_filepath)
+        print("✓ Exported")
+
     print(f"Exporting annual global totals to {ANNUAL_GLOBAL_FILEPATH}...")
-    annual_global.to_parquet(ANNUAL_GLOBAL_FILEPATH, index=False)
+    # ~25 rows, small enough that JSON loads faster than a parquet read
+    with open(ANNUAL_GLOBAL_FILEPATH, "w", encoding="utf-8") as f:
+        json.dump(annual_global.to_dict(orient="records"), f)
+    print("✓ Exported")
+
+    print(f"Exporting top region rankings to {TOP_REGIONS_FILEPATH}...")
+    export_parquet(top_regions, TOP_REGIONS_FILEPATH)
+    print("✓ Exported")
+
+    print(f"Exporting country borders to {COUNTRY_BORDERS_FILEPATH}...")
+    export_parquet(country_borders, COUNTRY_BORDERS_FILEPATH)
     print("✓ Exported")
 
     print(f"Exporting land outline to {LAND_OUTLINE_FILEPATH}...")
-    land_gdf.to_parquet(LAND_OUTLINE_FILEPATH, index=False)
+    export_parquet(land_gdf, LAND_OUTLINE_FILEPATH)
     print("✓ Exported")
 
 
@@ -0,0 +1,238 @@
+"""Run the preprocessing pipeline end to end on small synthetic inputs."""
+
+import json
+import os
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import Polygon, box
+
+import preprocess_data
+
+ISOS = ["AAA", "BBB", "CCC", "DDD"]
+COUNTRIES = {"AAA": "Alpha", "BBB": "Beta", "CCC": "Gamma", "DDD": "Delta"}
+SUBREGIONS = {"AAA": "North", "BBB": "North", "CCC": "South", "DDD": "South"}
+
+# Two codes from COUNTRY_CORRECTIONS plus plain ones, 105 and 106 have no name
+ADM1_CODES = [2720, 2961] + list(range(100, 110))
+NUM_EVENTS = 400
+
+
+def wiggly_polygon(rng, x0, y0, size, num_points=200):
+    """Noisy circle, so simplification has vertices to remove."""
+    t = np.linspace(0, 2 * np.pi, num_points, endpoint=False)
+    noise = 0.001 * rng.standard_normal((2, num_points))
+    return Polygon(
+        np.c_[
+            x0 + size / 2 * (1 + np.cos(t)) + noise[0],
+            y0 + size / 2 * (1 + np.sin(t)) + noise[1],
+        ]
+    )
+
+
+def write_inputs(root):
+    """Write synthetic versions of every file in data/original/."""
+    rng = np.random.default_rng(0)
+    original = root / "data" / "original"
+    for subdir in [
+        "GAUL_2015/g2015_2014_1",
+        "ne_110m_admin_0_countries",
+        "ne_110m_land",
+    ]:
+        (original / subdir).mkdir(parents=True)
+    (root / "data" / "preprocessed").mkdir()
+
+    gpd.GeoDataFrame(
+        {"ISO_A3": ISOS, "NAME": list(COUNTRIES.values())},
+        geometry=[box(i * 10, 0, i * 10 + 10, 10) for i in range(len(ISOS))],
+        crs="EPSG:4326",
+    ).to_file(original / "ne_110m_admin_0_countries" / "countries.shp")
+    gpd.GeoDataFrame(
+        {"featurecla": ["Land"], "scalerank": [0], "min_zoom": [0.0]},
+        geometry=[box(0, 0, 40, 10)],
+        crs="EPSG:4326",
+    ).to_file(original / "ne_110m_land" / "land.shp")
+    gpd.GeoDataFrame(
+        {"ADM1_CODE": ADM1_CODES, "ADM1_NAME": [f"n{c}" for c in ADM1_CODES]},
+        geometry=[
+            wiggly_polygon(rng, (i % 4) * 10 + 1, (i // 4) * 3, 2)
+            for i in range(len(ADM1_CODES))
+        ],
+        crs="EPSG:4326",
+    ).to_file(original / "GAUL_2015" / "g2015_2014_1" / "gaul.shp")
+
+    pd.DataFrame(
+        {
+            "ISO-alpha3 Code": ISOS + ["EEE"],
+            "Sub-region Name": [SUBREGIONS[iso] for iso in ISOS] + ["East"],
+            "Region Name": "World",
+        }
+    ).to_csv(original / "UNSD_M49.csv", index=False)
+
+    adm1_codes = rng.choice(ADM1_CODES, NUM_EVENTS)
+    isos = np.array([ISOS[ADM1_CODES.index(code) % 4] for code in adm1_codes])
+    names = {code: f"Adm {code}" for code in ADM1_CODES}
+    names[105] = "Administrative unit not available"
+    names[106] = None
+    flood_df = pd.DataFrame(
+        {
+            "id": np.arange(NUM_EVENTS),
+            "mon-yr-adm1-id": np.arange(NUM_EVENTS),
+            "mon-yr": [
+                f"{month:02d}-{year}"
+                for month, year in zip(
+                    rng.integers(1, 13, NUM_EVENTS),
+                    rng.integers(2000, 2025, NUM_EVENTS),
+                )
+            ],
+            "adm1_code": adm1_codes,
+            "adm1_name": [names[code] for code in adm1_codes],
+            "ISO": isos,
+            "Country": [COUNTRIES[iso] for iso in isos],
+            "Subregion": [SUBREGIONS[iso] for iso in isos],
+            "flooded_area": rng.random(NUM_EVENTS),
+            "flooded_area (normalized by adm1 area)": rng.random(NUM_EVENTS),
+            "Total Damage, Adjusted ('000 US$) (population-weighted)": rng.random(
+                NUM_EVENTS
+            )
+            * 1e3,
+            "Total Damage, Adjusted ('000 US$) (population-weighted, normalized by GDP)": rng.random(
+                NUM_EVENTS
+            ),
+            "Total Affected (population-weighted)": rng.random(NUM_EVENTS) * 1e4,
+            "Total Affected (population-weighted, normalized)": rng.random(NUM_EVENTS),
+            "event_precip_mean (mm/day)": rng.random(NUM_EVENTS) * 20,
+            "event_precip_75_quant_mean (mm/day)": rng.random(NUM_EVENTS) * 30,
+            "unused_column": "x",
+        }
+    )
+    # Rows without a month are dropped by the pipeline, missing values are skipped
+    flood_df.loc[:4, "mon-yr"] = None
+    flood_df.loc[10:29, "Total Affected (population-weighted)"] = np.nan
+    flood_df.to_csv(original / "event_level_flood_dataset.csv", index=False)
+    return flood_df.dropna(subset=["mon-yr"])
+
+
+@pytest.fixture(scope="module")
+def outputs(tmp_path_factory):
+    """Run main() once on the synthetic inputs, from their directory."""
+    root = tmp_path_factory.mktemp("pipeline")
+    events = write_inputs(root)
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        preprocess_data.main()
+    finally:
+        os.chdir(cwd)
+    return root, events
+
+
+def read_output(root, filepath):
+    return pd.read_parquet(root / filepath)
+
+
+def test_writes_every_output(outputs):
+    root, _ = outputs
+    for filepath in preprocess_data.OUTPUT_FILEPATHS:
+        assert (root / filepath).exists(), filepath
+
+
+def test_aggregated_schemas(outputs):
+    root, _ = outputs
+    value_cols = [
+        f"{metric}_{func}"
+        for metric in [
+            "damages",
+            "damages_norm",
+            "pop_affected",
+            "pop_affected_norm",
+            "flooded_area",
+            "flooded_area_norm",
+            "avg_precip",
+            "extreme_precip_75",
+        ]
+        for func in ["mean", "median", "max", "sum"]
+    ]
+    expected_columns = {
+        preprocess_data.ADMIN1_AGGREGATED_FILEPATH: ["adm1_code", "geometry"]
+        + value_cols
+        + ["flood_count", "Admin1 (States/Provinces)", "Country", "Display Name"],
+        preprocess_data.COUNTRY_AGGREGATED_FILEPATH: ["ISO", "geometry"]
+        + value_cols
+        + ["flood_count", "Country"],
+        preprocess_data.SUBREGION_AGGREGATED_FILEPATH: ["UN Subregion", "geometry"]
+        + value_cols
+        + ["flood_count"],
+    }
+    for filepath, columns in expected_columns.items():
+        gdf = gpd.read_parquet(root / filepath)
+        assert gdf.columns.tolist() == columns, filepath
+        assert (gdf[value_cols].dtypes == np.float64).all(), filepath
+
+
+def test_one_row_per_region(outputs):
+    root, events = outputs
+    admin1 = read_output(root, preprocess_data.ADMIN1_AGGREGATED_FILEPATH)
+    country = read_output(root, preprocess_data.COUNTRY_AGGREGATED_FILEPATH)
+    subregion = read_output(root, preprocess_data.SUBREGION_AGGREGATED_FILEPATH)
+
+    assert sorted(admin1["adm1_code"]) == sorted(events["adm1_code"].unique())
+    assert sorted(country["ISO"]) == sorted(events["ISO"].unique())
+    assert sorted(subregion["UN Subregion"]) == sorted(events["Subregion"].unique())
+    for level in [admin1, country, subregion]:
+        assert level["flood_count"].sum() == len(events)
+
+
+def test_unknown_admin1_names_are_labelled(outputs):
+    root, _ = outputs
+    admin1 = read_output(root, preprocess_data.ADMIN1_AGGREGATED_FILEPATH)
+    names = admin1.set_index("adm1_code")["Admin1 (States/Provinces)"]
+    assert names[105] == "Unknown Name (code: 105)"
+    assert names[106] == "Unknown Name (code: 106)"
+
+
+def test_admin1_countries_keep_corrections(outputs):
+    root, events = outputs
+    admin1 = read_output(root, preprocess_data.ADMIN1_AGGREGATED_FILEPATH)
+    admin1 = admin1.set_index("adm1_code")
+    country = read_output(root, preprocess_data.COUNTRY_AGGREGATED_FILEPATH)
+
+    # Corrected codes are labelled with their COUNTRY_CORRECTIONS name, even
+    # though the Country level names their ISO differently
+    corrected = admin1.index.isin(list(preprocess_data.COUNTRY_CORRECTIONS))
+    assert corrected.sum() == 2
+    for code, row in admin1[corrected].iterrows():
+        name = preprocess_data.COUNTRY_CORRECTIONS[code]
+        assert row["Country"] == name
+        assert row["Display Name"] == f"Adm {code}, {name}"
+    assert sorted(country["Country"]) == sorted(COUNTRIES.values())
+
+    # Other codes keep the country of their events
+    event_countries = events.drop_duplicates("adm1_code").set_index("adm1_code")
+    uncorrected = admin1[~corrected]
+    assert (
+        uncorrected["Country"].astype(str)
+        == event_countries.loc[uncorrected.index, "Country"]
+    ).all()
+
+
+def test_annual_totals(outputs):
+    root, events = outputs
+    with open(root / preprocess_data.ANNUAL_GLOBAL_FILEPATH, encoding="utf-8") as f:
+        annual = pd.DataFrame(json.load(f))
+    years = sorted(events["mon-yr"].str[-4:].astype(int).unique())
+    assert annual["year"].tolist() == years
+    assert annual["flood_count"].sum() == len(events)
+
+
+def test_rerun_skips_up_to_date_outputs(outputs, capsys):
+    root, _ = outputs
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        preprocess_data.main()
+    finally:
+        os.chdir(cwd)
+    assert "up to date" in capsys.readouterr().out